@@ -1,4 +1,3 @@
-
 import os
 import sys
 from pathlib import Path
@@ -9,7 +8,12 @@ sys.path.append(str(PROJECT_ROOT))
 
 # GUI 앱 임포트 및 실행
 from gui.app import create_interface
+from modules.job_queue import shutdown_job_queue
 
 if __name__ == "__main__":
     demo = create_interface()
-    demo.launch()
+    try:
+        demo.launch()
+    finally:
+        # 핸들러가 modules.job_queue를 사용했다면 실행기 정리
+        shutdown_job_queue(wait=False)
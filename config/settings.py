@@ -56,6 +56,22 @@ VIDEO_SETTINGS = {
 API_TIMEOUT = 30  # seconds
 MAX_RETRIES = 3
 
+# 게시 스케줄러 설정
+PUBLISH_TIMEZONE = 'Asia/Seoul'
+PUBLISH_SLOTS = ['09:00', '12:00', '18:00', '21:00']  # 하루 게시 시간대
+SCHEDULER_STATE_FILE = DATA_DIR / 'publish_schedule.json'
+
+# 플랫폼별 한도 (토큰 버킷: 하루 용량, 작업당 비용)
+PUBLISH_LIMITS = {
+    'youtube': {'capacity': 10000, 'cost': 1600},   # 일일 쿼터 10,000 units, 업로드 1,600 units
+    'instagram': {'capacity': 50, 'cost': 1},       # 24시간 게시 50개
+}
+
+# YouTube는 게시 시간보다 먼저 업로드하고 publishAt으로 공개 예약
+YOUTUBE_UPLOAD_LEAD_MINUTES = 30
+# 실행 시각을 이 시간 넘게 놓친 작업은 바로 올리지 않고 다음 빈 슬롯으로 재배정
+PUBLISH_GRACE_MINUTES = 30
+
 # ChatGPT 설정
 CHATGPT_MODEL = "gpt-4"
 CHATGPT_MAX_TOKENS = 2000
@@ -64,4 +80,7 @@ CHATGPT_TEMPERATURE = 0.7
 # Gemini 설정
 GEMINI_MODEL = "gemini-pro"
 
+# VEO3 설정
+VEO3_MODEL = "veo-3.0-generate-001"  # 9:16 세로 영상은 GA 모델에서 지원
+
 print("✅ Settings loaded successfully!")
@@ -0,0 +1,227 @@
+"""
+백그라운드 작업 큐 모듈
+GUI 요청은 작업 ID만 받고 바로 반환, 실제 작업은 종류별 풀에서 실행
+"""
+import uuid
+import inspect
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# 작업 종류별 (실행기, 동시 실행 수)
+# - convert: CPU 작업 → 프로세스 풀
+# - generate / upload: 네트워크 대기 → 스레드 풀
+JOB_TYPES = {
+    'convert': ('process', 2),
+    'generate': ('thread', 3),
+    'upload': ('thread', 2),
+}
+
+# 완료/실패 작업 보관 개수 (초과분은 오래된 것부터 삭제)
+MAX_FINISHED_JOBS = 200
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _accepts_progress(func):
+    """func가 progress_callback을 명시적 인자로 받는지 확인"""
+    try:
+        return 'progress_callback' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _run_in_process(progress_queue, job_id, func, args, kwargs):
+    """프로세스 풀에서 실행되는 래퍼 (상태/진행률을 Manager 큐로 보고)"""
+    progress_queue.put((job_id, {'status': RUNNING, 'message': '실행 중'}))
+
+    if _accepts_progress(func):
+        def progress_callback(progress, message=''):
+            progress_queue.put((job_id, {'progress': float(progress), 'message': message}))
+
+        kwargs = dict(kwargs, progress_callback=progress_callback)
+    return func(*args, **kwargs)
+
+
+class JobQueue:
+    def __init__(self, job_types=None, max_finished_jobs=MAX_FINISHED_JOBS):
+        """작업 종류별 실행기 생성"""
+        self.job_types = job_types or JOB_TYPES
+        self.max_finished_jobs = max_finished_jobs
+        self.executors = {}
+        self._mp_context = multiprocessing.get_context('spawn')
+        self._manager = None
+        self._progress_queue = None
+        for job_type, (kind, limit) in self.job_types.items():
+            if kind == 'process':
+                # Gradio 서버 스레드가 도는 중에 fork하면 교착될 수 있어 spawn 사용
+                self.executors[job_type] = ProcessPoolExecutor(
+                    max_workers=limit, mp_context=self._mp_context
+                )
+            else:
+                self.executors[job_type] = ThreadPoolExecutor(
+                    max_workers=limit, thread_name_prefix=f"job-{job_type}"
+                )
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job_type, func, *args, **kwargs):
+        """
+        작업 등록 후 작업 ID 즉시 반환
+
+        func가 progress_callback 인자를 명시적으로 받을 때만
+        progress_callback(progress, message)를 전달함
+        (프로세스 작업은 func와 인자가 pickle 가능해야 함)
+        """
+        if job_type not in self.executors:
+            raise ValueError(f"알 수 없는 작업 종류: {job_type}")
+
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self.jobs[job_id] = {
+                'id': job_id,
+                'type': job_type,
+                'status': PENDING,
+                'progress': 0.0,
+                'message': '대기 중',
+                'result': None,
+                'error': None,
+                'created_at': datetime.now().isoformat(),
+            }
+
+        kind = self.job_types[job_type][0]
+        if kind == 'process':
+            future = self.executors[job_type].submit(
+                _run_in_process, self._get_progress_queue(), job_id, func, args, kwargs
+            )
+        else:
+            future = self.executors[job_type].submit(self._run, job_id, func, args, kwargs)
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+
+        print(f"📥 작업 등록: {job_type} ({job_id})")
+        return job_id
+
+    def _run(self, job_id, func, args, kwargs):
+        """스레드 작업 실행 (진행률 콜백 연결)"""
+        self._update(job_id, status=RUNNING, message='실행 중')
+
+        if _accepts_progress(func):
+            def progress_callback(progress, message=''):
+                self._update(job_id, progress=float(progress), message=message)
+
+            kwargs = dict(kwargs, progress_callback=progress_callback)
+        return func(*args, **kwargs)
+
+    def _get_progress_queue(self):
+        """프로세스 작업 보고용 Manager 큐 (처음 쓸 때 생성)"""
+        with self._lock:
+            if self._progress_queue is None:
+                self._manager = self._mp_context.Manager()
+                self._progress_queue = self._manager.Queue()
+                threading.Thread(
+                    target=self._listen_progress, args=(self._progress_queue,),
+                    name='job-progress', daemon=True,
+                ).start()
+            return self._progress_queue
+
+    def _listen_progress(self, progress_queue):
+        """프로세스 작업의 보고를 받아 상태에 반영"""
+        while True:
+            try:
+                message = progress_queue.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            job_id, fields = message
+            with self._lock:
+                job = self.jobs.get(job_id)
+                # 완료 처리가 먼저 된 경우 늦게 도착한 보고는 무시
+                if job and job['status'] not in (DONE, FAILED):
+                    job.update(fields)
+
+    def _finish(self, job_id, future):
+        """완료/실패 기록"""
+        try:
+            result = future.result()
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e), message='실패')
+            print(f"❌ 작업 실패 ({job_id}): {e}")
+        else:
+            self._update(job_id, status=DONE, progress=1.0, result=result, message='완료')
+            print(f"✅ 작업 완료 ({job_id})")
+        self._prune()
+
+    def _prune(self):
+        """오래된 완료/실패 작업 정리"""
+        with self._lock:
+            finished = [
+                job for job in self.jobs.values() if job['status'] in (DONE, FAILED)
+            ]
+            excess = len(finished) - self.max_finished_jobs
+            if excess <= 0:
+                return
+            finished.sort(key=lambda job: job['created_at'])
+            for job in finished[:excess]:
+                del self.jobs[job['id']]
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self.jobs[job_id].update(fields)
+
+    def get_status(self, job_id):
+        """작업 상태 조회 (없으면 None)"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self):
+        """전체 작업 목록 (최신순)"""
+        with self._lock:
+            jobs = [dict(job) for job in self.jobs.values()]
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+    def get_statuses(self, job_ids):
+        """
+        여러 작업 상태를 한 번에 조회
+
+        GUI에서는 gr.Timer로 짧게 주기 호출해서 진행률을 갱신
+        (작업이 끝날 때까지 붙잡는 제너레이터 핸들러는 이벤트 워커를 독점함)
+        """
+        with self._lock:
+            return [dict(self.jobs[job_id]) for job_id in job_ids if job_id in self.jobs]
+
+    def shutdown(self, wait=True):
+        """모든 실행기 종료"""
+        for executor in self.executors.values():
+            executor.shutdown(wait=wait)
+        if self._manager is not None:
+            self._progress_queue.put(None)
+            self._manager.shutdown()
+
+
+# GUI 전체에서 공유하는 큐 (핸들러 스레드에서 동시에 호출되므로 lock으로 보호)
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """공유 JobQueue 반환 (최초 호출시 생성)"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
+
+
+def shutdown_job_queue(wait=False):
+    """공유 JobQueue가 만들어졌다면 종료"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is not None:
+            _job_queue.shutdown(wait=wait)
+            _job_queue = None
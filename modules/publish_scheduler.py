@@ -0,0 +1,431 @@
+"""
+쿼터/게시 한도를 고려한 업로드 스케줄러
+플랫폼별 토큰 버킷 + 타임존 기준 게시 시간대로 대기 영상을 배치
+"""
+import os
+import json
+import uuid
+import threading
+from datetime import datetime, timedelta
+
+import pytz
+
+from config.settings import (
+    PUBLISH_TIMEZONE, PUBLISH_SLOTS, PUBLISH_LIMITS,
+    SCHEDULER_STATE_FILE, MAX_RETRIES, YOUTUBE_UPLOAD_LEAD_MINUTES,
+    PUBLISH_GRACE_MINUTES,
+)
+
+DAY_SECONDS = 24 * 60 * 60
+
+# 완료/실패 작업 보관 개수 (초과분은 오래된 것부터 상태 파일에서 삭제)
+MAX_FINISHED_ITEMS = 100
+
+# 플랫폼별 업로더 인자 (필수, 허용)
+UPLOAD_ARGS = {
+    'youtube': ({'title'}, {'title', 'description', 'tags'}),
+    'instagram': (set(), {'caption', 'tags'}),
+}
+
+QUEUED = 'queued'
+UPLOADING = 'uploading'
+DONE = 'done'
+FAILED = 'failed'
+# 업로드 중 프로세스가 죽은 작업: 실제 업로드 여부를 알 수 없어 자동 재시도하지 않음
+INTERRUPTED = 'interrupted'
+
+
+class TokenBucket:
+    def __init__(self, capacity, cost=1, tokens=None, updated_at=None):
+        """
+        Args:
+            capacity: 버킷 용량 (24시간 동안 채워지는 양)
+            cost: 작업 1건당 소모량
+            tokens: 현재 토큰 (없으면 가득)
+            updated_at: 마지막 갱신 시각 (UTC timestamp)
+        """
+        if cost > capacity:
+            raise ValueError(f"작업 비용({cost})이 버킷 용량({capacity})보다 큽니다")
+        self.capacity = capacity
+        self.cost = cost
+        self.rate = capacity / DAY_SECONDS
+        self.tokens = capacity if tokens is None else tokens
+        self.updated_at = updated_at or datetime.now(pytz.utc).timestamp()
+
+    def available(self, at):
+        """at 시점(UTC timestamp)의 토큰 수"""
+        elapsed = max(0, at - self.updated_at)
+        return min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def consume(self, at):
+        """at 시점에 1건 소모 (부족하면 False)"""
+        tokens = self.available(at)
+        if tokens < self.cost:
+            return False
+        self.tokens = tokens - self.cost
+        self.updated_at = max(self.updated_at, at)
+        return True
+
+    def copy(self):
+        return TokenBucket(self.capacity, self.cost, self.tokens, self.updated_at)
+
+    def to_dict(self):
+        return {
+            'capacity': self.capacity,
+            'cost': self.cost,
+            'tokens': self.tokens,
+            'updated_at': self.updated_at,
+        }
+
+
+class PublishScheduler:
+    def __init__(self, state_file=None, timezone=None, slots=None, limits=None):
+        """저장된 상태가 있으면 불러와서 초기화"""
+        self.state_file = str(state_file or SCHEDULER_STATE_FILE)
+        self.tz = pytz.timezone(timezone or PUBLISH_TIMEZONE)
+        self.slots = [tuple(int(x) for x in s.split(':')) for s in (slots or PUBLISH_SLOTS)]
+        self.slots.sort()
+        limits = limits or PUBLISH_LIMITS
+        self.buckets = {
+            platform: TokenBucket(limit['capacity'], limit['cost'])
+            for platform, limit in limits.items()
+        }
+        self.queue = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.load_state()
+
+    # ---------- 큐 관리 ----------
+
+    def add(self, platform, video_path, **upload_kwargs):
+        """
+        업로드 대기열에 추가하고 게시 시간 배정
+
+        Args:
+            platform: 'youtube' 또는 'instagram'
+            video_path: 비디오 파일 경로
+            upload_kwargs: 업로더에 그대로 넘길 인자 (title, caption, tags 등)
+                           재시작 후에도 쓰이므로 JSON으로 저장 가능해야 함
+
+        Returns:
+            dict: 배정된 작업 정보
+        """
+        if platform not in self.buckets:
+            raise ValueError(f"지원하지 않는 플랫폼: {platform}")
+        if 'schedule_time' in upload_kwargs:
+            raise ValueError("schedule_time은 스케줄러가 정합니다")
+        # 잘못된 인자로 쿼터만 소모하고 실패하지 않도록 미리 확인
+        required, allowed = UPLOAD_ARGS.get(platform, (set(), set(upload_kwargs)))
+        missing = required - set(upload_kwargs)
+        unknown = set(upload_kwargs) - allowed
+        if missing or unknown:
+            raise ValueError(
+                f"{platform} 업로드 인자 오류 (누락: {sorted(missing)}, 알 수 없음: {sorted(unknown)})"
+            )
+        try:
+            json.dumps(upload_kwargs)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"업로드 인자를 저장할 수 없습니다: {e}")
+
+        item = {
+            'id': uuid.uuid4().hex[:12],
+            'platform': platform,
+            'video_path': str(video_path),
+            'kwargs': upload_kwargs,
+            'status': QUEUED,
+            'attempts': 0,
+            'publish_at': None,
+            'result': None,
+        }
+        with self._lock:
+            self.queue.append(item)
+            self._plan()
+            self.save_state()
+        print(f"🗓️ {platform} 게시 예약: {item['publish_at']}")
+        return dict(item)
+
+    def pending(self):
+        """대기 중인 작업 목록 (게시 시간순)"""
+        with self._lock:
+            items = [dict(i) for i in self.queue if i['status'] == QUEUED]
+        return sorted(items, key=lambda i: i['publish_at'] or '')
+
+    def requeue(self, item_id):
+        """중단/실패한 작업을 다시 대기열에 넣고 새 슬롯 배정"""
+        with self._lock:
+            item = self._find(item_id)
+            if item['status'] not in (INTERRUPTED, FAILED):
+                raise ValueError(f"다시 넣을 수 없는 상태입니다: {item['status']}")
+            item.update(status=QUEUED, attempts=0, publish_at=None)
+            self._plan()
+            self.save_state()
+            return dict(item)
+
+    def mark_done(self, item_id, result=None):
+        """중단된 작업이 실제로 올라갔음을 확인한 경우 완료 처리"""
+        with self._lock:
+            item = self._find(item_id)
+            if item['status'] != INTERRUPTED:
+                raise ValueError(f"완료 처리할 수 없는 상태입니다: {item['status']}")
+            self._finish(item, DONE, result)
+            self._prune()
+            self.save_state()
+            return dict(item)
+
+    def _find(self, item_id):
+        for item in self.queue:
+            if item['id'] == item_id:
+                return item
+        raise KeyError(f"작업 없음: {item_id}")
+
+    def _finish(self, item, status, result=None):
+        item['status'] = status
+        item['result'] = result
+        item['finished_at'] = datetime.now(pytz.utc).isoformat()
+
+    def _prune(self):
+        """오래된 완료/실패 작업 정리"""
+        finished = [i for i in self.queue if i['status'] in (DONE, FAILED)]
+        excess = len(finished) - MAX_FINISHED_ITEMS
+        if excess <= 0:
+            return
+        finished.sort(key=lambda i: i.get('finished_at') or '')
+        stale = {id(i) for i in finished[:excess]}
+        self.queue = [i for i in self.queue if id(i) not in stale]
+
+    # ---------- 슬롯 배치 ----------
+
+    def _iter_slots(self, start):
+        """start(aware datetime) 이후의 게시 시간대를 순서대로 생성"""
+        local = start.astimezone(self.tz)
+        day = local.date()
+        while True:
+            for hour, minute in self.slots:
+                slot = self.tz.localize(datetime(day.year, day.month, day.day, hour, minute))
+                if slot >= local:
+                    yield slot
+            day += timedelta(days=1)
+
+    def _lead(self, platform):
+        """게시 시각보다 얼마나 먼저 업로드하는지"""
+        if platform == 'youtube':
+            return timedelta(minutes=YOUTUBE_UPLOAD_LEAD_MINUTES)
+        return timedelta(0)
+
+    def _run_at(self, item):
+        """작업을 실행(업로드)할 시각"""
+        return datetime.fromisoformat(item['publish_at']) - self._lead(item['platform'])
+
+    def _plan(self, now=None):
+        """
+        아직 슬롯이 없는 작업만 빈 슬롯에 배정
+        이미 배정된 슬롯은 그대로 두고 한도 계산에만 반영
+        """
+        now = now or datetime.now(pytz.utc)
+        self._release_missed(now)
+        queued = [i for i in self.queue if i['status'] == QUEUED]
+
+        for platform, bucket in self.buckets.items():
+            unassigned = [i for i in queued if i['platform'] == platform and not i['publish_at']]
+            if not unassigned:
+                continue
+
+            lead = self._lead(platform)
+            simulated = bucket.copy()
+            reserved = set()
+            for item in (i for i in queued if i['platform'] == platform and i['publish_at']):
+                run_at = self._run_at(item)
+                if run_at <= now:
+                    # 유예 시간 안에 밀린 작업은 곧 실행되므로 지금 소모
+                    simulated.consume(now.timestamp())
+                else:
+                    reserved.add(datetime.fromisoformat(item['publish_at']))
+
+            for slot in self._iter_slots(now + lead):
+                if not unassigned:
+                    break
+                run_ts = (slot - lead).timestamp()
+                if slot in reserved:
+                    simulated.consume(run_ts)
+                elif simulated.consume(run_ts):
+                    unassigned.pop(0)['publish_at'] = slot.isoformat()
+
+    def _release_missed(self, now):
+        """
+        실행 시각을 유예 시간 넘게 놓친 작업의 슬롯 해제
+        (장애 후 재시작시 밀린 작업을 한꺼번에 올려 쿼터를 다 쓰는 것 방지)
+        """
+        grace = timedelta(minutes=PUBLISH_GRACE_MINUTES)
+        released = 0
+        for item in self.queue:
+            if (item['status'] == QUEUED and item['publish_at']
+                    and self._run_at(item) + grace < now):
+                item['publish_at'] = None
+                released += 1
+        if released:
+            print(f"⏳ 실행 시각을 놓친 작업 {released}건 재배정")
+        return released
+
+    # ---------- 실행 ----------
+
+    def _claim_due(self, now, platforms):
+        """플랫폼마다 실행할 작업 1건을 골라 uploading으로 표시 (lock 안에서 호출)"""
+        if self._release_missed(now):
+            self._plan(now)
+
+        claimed = []
+        for platform in platforms:
+            bucket = self.buckets[platform]
+            due = sorted(
+                (i for i in self.queue
+                 if i['platform'] == platform and i['status'] == QUEUED
+                 and i['publish_at'] and self._run_at(i) <= now),
+                key=lambda i: i['publish_at'],
+            )
+            if not due:
+                continue
+
+            item = due[0]
+            if not bucket.consume(now.timestamp()):
+                # 한도 초과 → 다음 슬롯으로 미룸
+                print(f"⏳ {platform} 한도 초과, 다음 슬롯으로 연기")
+                item['publish_at'] = None
+                self._plan(now + timedelta(seconds=1))
+                continue
+
+            item['status'] = UPLOADING
+            item['attempts'] += 1
+            claimed.append(item)
+        return claimed
+
+    def run_due(self, uploaders, now=None):
+        """
+        실행 시각이 된 작업을 플랫폼별로 1건씩 실행
+        (밀린 작업이 많아도 한 번에 몰아서 올리지 않음)
+
+        Args:
+            uploaders: {'youtube': YouTubeUploader, 'instagram': InstagramUploader}
+
+        Returns:
+            list: 이번에 처리된 작업
+        """
+        now = now or datetime.now(pytz.utc)
+        with self._lock:
+            available = {
+                p: u for p, u in uploaders.items() if u is not None and p in self.buckets
+            }
+            claimed = self._claim_due(now, available)
+            self.save_state()
+
+        processed = []
+        for item in claimed:
+            result = self._upload(available[item['platform']], item, now)
+
+            with self._lock:
+                if result:
+                    self._finish(item, DONE, result)
+                elif item['attempts'] >= MAX_RETRIES:
+                    self._finish(item, FAILED)
+                else:
+                    # 실패해도 즉시 재시도하지 않고 다음 슬롯에 다시 배정
+                    item['status'] = QUEUED
+                    item['publish_at'] = None
+                    self._plan(now + timedelta(seconds=1))
+                self._prune()
+                self.save_state()
+            processed.append(dict(item))
+
+        return processed
+
+    def _upload(self, uploader, item, now):
+        """플랫폼별 업로드 호출 (실패시 None)"""
+        try:
+            if item['platform'] == 'youtube':
+                # 게시 시각이 지났으면 가능한 가장 빠른 시각으로 공개 예약
+                publish_at = max(
+                    datetime.fromisoformat(item['publish_at']),
+                    now + timedelta(minutes=5),
+                )
+                return uploader.upload_video(
+                    item['video_path'], schedule_time=publish_at, **item['kwargs']
+                )
+            return uploader.upload_reels(item['video_path'], **item['kwargs'])
+        except Exception as e:
+            print(f"❌ {item['platform']} 업로드 실패: {e}")
+            return None
+
+    def start(self, uploaders, interval=60):
+        """백그라운드 스레드에서 interval초마다 run_due 실행"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.run_due(uploaders)
+                except Exception as e:
+                    print(f"❌ 스케줄러 실행 오류: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name='publish-scheduler', daemon=True)
+        self._thread.start()
+        print("▶️ 게시 스케줄러 시작")
+
+    def stop(self):
+        """백그라운드 스레드 종료"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    # ---------- 상태 저장 ----------
+
+    def save_state(self):
+        """버킷과 대기열을 JSON으로 저장"""
+        state = {
+            'buckets': {p: b.to_dict() for p, b in self.buckets.items()},
+            'queue': self.queue,
+        }
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def load_state(self):
+        """저장된 상태 불러오기 (없으면 무시)"""
+        if not os.path.exists(self.state_file):
+            return
+
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        for platform, data in state.get('buckets', {}).items():
+            if platform in self.buckets:
+                bucket = self.buckets[platform]
+                bucket.tokens = min(bucket.capacity, data['tokens'])
+                bucket.updated_at = data['updated_at']
+        self.queue = state.get('queue', [])
+
+        # 업로드 도중 종료된 작업은 중복 업로드를 막기 위해 수동 확인으로 넘김
+        for item in self.queue:
+            if item['status'] == UPLOADING:
+                item['status'] = INTERRUPTED
+                print(f"⚠️ 업로드 중 중단된 작업: {item['video_path']} (확인 후 requeue/mark_done, id={item['id']})")
+        print(f"📂 스케줄 상태 로드: 대기 {len(self.pending())}건")
+
+
+# 같은 상태 파일을 여러 인스턴스가 덮어쓰지 않도록 공유 (lock으로 보호)
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_publish_scheduler():
+    """공유 PublishScheduler 반환 (최초 호출시 생성)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PublishScheduler()
+        return _scheduler
@@ -1,7 +1,189 @@
-class VideoCreator:
-    def __init__(self, *args, **kwargs):
-        print("ℹ️ 비디오 생성은 Flow 웹사이트를 사용하세요")
-    
-    def create_video_from_script(self, script, progress_callback=None):
-        # GUI에서 사용 안 함
-        return None
\ No newline at end of file
+"""
+VEO3 비디오 생성 모듈 (google-genai)
+"""
+import os
+import json
+import time
+import uuid
+import requests
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config.settings import (
+    GEMINI_API_KEY, VEO3_MODEL, VIDEO_OUTPUT_DIR, API_TIMEOUT, MAX_RETRIES,
+)
+
+
+class VideoCreator:
+    def __init__(self, api_key=None, base_url=None, client=None,
+                 max_workers=3, poll_interval=10, max_poll_interval=60, timeout=900):
+        """
+        google-genai 클라이언트 초기화
+
+        Args:
+            api_key: Gemini API 키 (없으면 환경변수)
+            base_url: API 엔드포인트 (로컬 가짜 서버 테스트용)
+            client: 미리 만든 genai.Client (주입용)
+            max_workers: 동시 제출 작업 수
+            poll_interval: 첫 폴링 간격(초), 이후 2배씩 증가
+            max_poll_interval: 폴링 간격 상한(초)
+            timeout: 작업당 최대 대기 시간(초)
+        """
+        self.api_key = api_key or GEMINI_API_KEY or os.getenv('GEMINI_API_KEY')
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+        self.output_dir = Path(VIDEO_OUTPUT_DIR)
+
+        if client is not None:
+            self.client = client
+        else:
+            if not self.api_key:
+                raise ValueError("Gemini API 키가 필요합니다 (.env에 GEMINI_API_KEY 추가)")
+
+            from google import genai
+            from google.genai import types
+
+            http_options = types.HttpOptions(base_url=base_url) if base_url else None
+            self.client = genai.Client(api_key=self.api_key, http_options=http_options)
+        print("✅ VEO3 클라이언트 준비")
+
+    def create_video_from_script(self, script, progress_callback=None):
+        """스크립트 하나로 비디오 생성 → 저장 경로 반환 (실패시 None)"""
+        results = self.create_videos([script], progress_callback=progress_callback)
+        return results[0]
+
+    def create_videos(self, scripts, progress_callback=None):
+        """
+        여러 스크립트를 동시에 제출하고 완료된 순서대로 다운로드
+
+        Returns:
+            list: 입력 순서대로 저장 경로 (실패한 항목은 None)
+        """
+        results = [None] * len(scripts)
+        if not scripts:
+            return results
+
+        workers = max(1, min(self.max_workers, len(scripts)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._generate_one, script, index): index
+                for index, script in enumerate(scripts)
+            }
+            done = 0
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"❌ 비디오 생성 실패 ({index + 1}/{len(scripts)}): {e}")
+                done += 1
+                if progress_callback:
+                    progress_callback(done / len(scripts), f"{done}/{len(scripts)} 완료")
+
+        return results
+
+    def _generate_one(self, script, index=0):
+        """작업 제출 → 폴링 → 다운로드"""
+        from google.genai import types
+
+        operation = self._call_with_retry(
+            self.client.models.generate_videos,
+            model=VEO3_MODEL,
+            prompt=self._build_prompt(script),
+            config=types.GenerateVideosConfig(aspect_ratio="9:16", number_of_videos=1),
+        )
+        print(f"🎬 VEO3 작업 제출: {operation.name}")
+
+        operation = self._wait_for(operation)
+
+        if operation.error:
+            raise Exception(f"VEO3 작업 오류: {operation.error}")
+        if not operation.response or not operation.response.generated_videos:
+            raise Exception("생성된 비디오가 없습니다")
+
+        video = operation.response.generated_videos[0].video
+        return self._download(video, self._output_path(script, index))
+
+    def _wait_for(self, operation):
+        """지수 백오프로 long-running operation 폴링"""
+        interval = self.poll_interval
+        deadline = time.monotonic() + self.timeout
+
+        while not operation.done:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"VEO3 작업 시간 초과: {operation.name}")
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+            operation = self._call_with_retry(self.client.operations.get, operation)
+
+        return operation
+
+    def _call_with_retry(self, func, *args, **kwargs):
+        """
+        일시적 오류(429, 5xx, 연결 오류)는 백오프 후 재시도
+        (폴링 실패로 작업을 버리면 서버에서 생성된 유료 결과를 잃음)
+        """
+        interval = self.poll_interval
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= MAX_RETRIES or not self._is_transient(e):
+                    raise
+                print(f"⚠️ 일시적 오류, {interval}초 후 재시도 ({attempt + 1}/{MAX_RETRIES}): {e}")
+                time.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+
+    @staticmethod
+    def _is_transient(error):
+        """재시도할 만한 오류인지 판단"""
+        if isinstance(error, (ConnectionError, TimeoutError, requests.ConnectionError)):
+            return True
+        try:
+            import httpx
+            if isinstance(error, httpx.TransportError):
+                return True
+        except ImportError:
+            pass
+        code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+        return isinstance(code, int) and (code == 429 or code >= 500)
+
+    def _download(self, video, output_path):
+        """완료된 비디오를 data/videos로 스트리밍 저장"""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_suffix(output_path.suffix + '.part')
+
+        if video.video_bytes:
+            with open(tmp_path, 'wb') as f:
+                f.write(video.video_bytes)
+        else:
+            headers = {'x-goog-api-key': self.api_key} if self.api_key else {}
+            with requests.get(video.uri, headers=headers, stream=True, timeout=API_TIMEOUT) as response:
+                response.raise_for_status()
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        if chunk:
+                            f.write(chunk)
+
+        os.replace(tmp_path, output_path)
+        print(f"📁 비디오 저장: {output_path}")
+        return str(output_path)
+
+    def _build_prompt(self, script):
+        """스크립트(dict 또는 문자열)를 VEO3 프롬프트로 변환"""
+        if isinstance(script, str):
+            return script
+        meta_keys = ('service', 'keyword', 'generated_at', 'korean_summary')
+        prompt = {k: v for k, v in script.items() if k not in meta_keys}
+        return json.dumps(prompt, ensure_ascii=False)
+
+    def _output_path(self, script, index):
+        """저장 파일 경로 생성 (동시 작업끼리 겹치지 않도록 uuid 포함)"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        keyword = script.get('keyword', 'video') if isinstance(script, dict) else 'video'
+        keyword_clean = str(keyword).replace(' ', '_').replace('/', '_')
+        return self.output_dir / f"veo3_{keyword_clean}_{timestamp}_{index}_{uuid.uuid4().hex[:8]}.mp4"
@@ -3,10 +3,14 @@ YouTube 업로드 모듈 - 간결 버전
 """
 import os
 import pickle
+from datetime import datetime, timezone
+import pytz
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from google.auth.transport.requests import Request
 
+from config.settings import PUBLISH_TIMEZONE
+
 class YouTubeUploader:
     def __init__(self, token_file):
         """토큰 파일로 초기화"""
@@ -31,10 +35,13 @@ class YouTubeUploader:
         print("✅ YouTube API 연결 성공")
     
     def upload_video(self, video_path, title, description="", tags=None, schedule_time=None):
-        """비디오 업로드"""
-        if not tags:
-            tags = []
-        tags.append("shorts")
+        """
+        비디오 업로드
+
+        schedule_time: datetime 또는 ISO/RFC3339 문자열. 지정하면 비공개로 올린 뒤
+        해당 시각에 공개됨 (타임존이 없으면 PUBLISH_TIMEZONE 기준)
+        """
+        tags = list(tags or []) + ["shorts"]
         
         body = {
             'snippet': {
@@ -50,7 +57,7 @@ class YouTubeUploader:
         }
         
         if schedule_time:
-            body['status']['publishAt'] = schedule_time
+            body['status']['publishAt'] = self._to_rfc3339(schedule_time)
         
         media = MediaFileUpload(video_path, mimetype='video/mp4', resumable=True)
         request = self.youtube.videos().insert(
@@ -65,4 +72,17 @@ class YouTubeUploader:
             'id': response['id'],
             'url': f"https://youtube.com/shorts/{response['id']}",
             'title': title
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def _to_rfc3339(schedule_time):
+        """publishAt 형식(RFC3339 UTC)으로 변환"""
+        if isinstance(schedule_time, str):
+            try:
+                schedule_time = datetime.fromisoformat(schedule_time.replace('Z', '+00:00'))
+            except ValueError:
+                # 해석할 수 없는 문자열은 예전처럼 API에 그대로 전달
+                return schedule_time
+        if schedule_time.tzinfo is None:
+            schedule_time = pytz.timezone(PUBLISH_TIMEZONE).localize(schedule_time)
+        return schedule_time.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
\ No newline at end of file